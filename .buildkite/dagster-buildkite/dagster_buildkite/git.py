@@ -1,15 +1,20 @@
+import functools
 import logging
 import os
 import subprocess
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Set
+from typing import Dict, List, Optional, Set
 
 
+# Revisions don't move while we generate a pipeline, and these are called repeatedly (e.g.
+# `message_contains` runs for every package's skip check), so only shell out once per rev.
+@functools.lru_cache(maxsize=None)
 def get_commit(rev):
     return subprocess.check_output(["git", "rev-parse", "--short", rev]).decode("utf-8").strip()
 
 
+@functools.lru_cache(maxsize=None)
 def get_commit_message(rev):
     return (
         subprocess.check_output(["git", "rev-list", "--format=%B", "--max-count=1", rev])
@@ -26,38 +31,97 @@ class GitInfo:
 
 class ChangedFiles:
     _repositories: Set[Path] = set()
+    _fetches: Dict[Path, Optional["subprocess.Popen[bytes]"]] = dict()
     all: Set[Path] = set()
 
+    @classmethod
+    def start_fetch(cls, git_info: GitInfo) -> None:
+        """Fetch the base branch in the background, so that the network round trip overlaps with
+        any other work done before `load_from_git` needs to diff against it.
+        """
+        if (
+            git_info.directory in cls._repositories
+            or git_info.directory in cls._fetches
+            or os.getenv("BUILDKITE_CHANGED_FILES_PATH")
+        ):
+            return None
+
+        base_branch = str(git_info.base_branch)
+        cls._fetches[git_info.directory] = (
+            subprocess.Popen(["git", "fetch", "origin", base_branch], cwd=str(git_info.directory))
+            if _should_fetch_base_branch(git_info.directory, base_branch)
+            else None
+        )
+
     @classmethod
     def load_from_git(cls, git_info: GitInfo) -> None:
         # Only do the expensive git diffing once
         if git_info.directory in cls._repositories:
             return None
 
-        original_directory = os.getcwd()
-        os.chdir(git_info.directory)
+        # A previous step may have already computed the changeset and written it to a
+        # newline-delimited file, in which case we can skip git entirely
+        changed_files_path = os.getenv("BUILDKITE_CHANGED_FILES_PATH")
+        if changed_files_path:
+            logging.info(f"Changed files (read from {changed_files_path}):")
+            paths = [path for path in Path(changed_files_path).read_text().splitlines() if path]
+        else:
+            cls.start_fetch(git_info)
+            fetch = cls._fetches.pop(git_info.directory)
+            if fetch:
+                fetch.wait()
+            paths = _diff_against_base_branch(git_info)
 
-        subprocess.call(["git", "fetch", "origin", str(git_info.base_branch)])
-        origin = get_commit(f"origin/{git_info.base_branch}")
-        head = get_commit("HEAD")
-        logging.info(
-            f"Changed files between origin/{git_info.base_branch} ({origin}) and HEAD ({head}):"
-        )
-        paths = (
-            subprocess.check_output(
-                [
-                    "git",
-                    "diff",
-                    f"origin/{git_info.base_branch}...HEAD",
-                    "--name-only",
-                ]
-            )
-            .decode("utf-8")
-            .strip()
-            .split("\n")
+        cls.all.update(git_info.directory / path for path in paths)
+        # Ordering only matters for readable logs
+        if logging.getLogger().isEnabledFor(logging.INFO):
+            for path in sorted(paths):
+                logging.info("  - " + path)
+
+        cls._repositories.add(git_info.directory)
+
+
+def _diff_against_base_branch(git_info: GitInfo) -> List[str]:
+    # Resolve both ends of the diff with a single git invocation. `--short` implies
+    # `--verify`, which only accepts one revision, so abbreviate the hashes ourselves.
+    origin, head = (
+        commit[:7]
+        for commit in subprocess.check_output(
+            ["git", "rev-parse", f"origin/{git_info.base_branch}", "HEAD"],
+            cwd=str(git_info.directory),
         )
-        for path in sorted(paths):
-            logging.info("  - " + path)
-            cls.all.add(git_info.directory / path)
+        .decode("utf-8")
+        .split()
+    )
+    logging.info(
+        f"Changed files between origin/{git_info.base_branch} ({origin}) and HEAD ({head}):"
+    )
+    # NUL-delimited output lets us split the raw bytes directly without decoding and
+    # stripping the whole blob first
+    output = subprocess.check_output(
+        [
+            "git",
+            "diff",
+            f"origin/{git_info.base_branch}...HEAD",
+            "--name-only",
+            "-z",
+        ],
+        cwd=str(git_info.directory),
+    )
+    return [os.fsdecode(path) for path in output.split(b"\0") if path]
+
 
-        os.chdir(original_directory)
+def _should_fetch_base_branch(directory: Path, base_branch: str) -> bool:
+    # Pull request builds check out against the base branch already, so avoid the network
+    # round trip if its remote ref is available locally
+    if os.getenv("BUILDKITE_PULL_REQUEST_BASE_BRANCH") != base_branch:
+        return True
+
+    return (
+        subprocess.call(
+            ["git", "rev-parse", "--verify", "--quiet", f"origin/{base_branch}"],
+            cwd=str(directory),
+            stdout=subprocess.DEVNULL,
+        )
+        != 0
+    )
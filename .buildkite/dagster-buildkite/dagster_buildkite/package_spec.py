@@ -1,8 +1,9 @@
+import functools
 import logging
 import os
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable, List, Mapping, Optional, Union
+from typing import Callable, FrozenSet, List, Mapping, Optional, Union
 
 import pkg_resources
 from typing_extensions import TypeAlias
@@ -60,6 +61,40 @@ def _infer_package_type(directory: str) -> str:
     "unknown": ":grey_question:",
 }
 
+
+# Several specs (and ad-hoc specs built by skip helpers) can point at the same package, so
+# resolve requirements once per package rather than once per spec.
+@functools.lru_cache(maxsize=None)
+def _requirements(name: Optional[str], directory: str) -> FrozenSet[pkg_resources.Requirement]:
+    # First try to infer requirements from the python package
+    package = PythonPackages.get(name) if name else None
+    if package:
+        return package.install_requires.union(*package.extras_require.values())
+
+    # If we don't have a distribution (like many of our integration test suites)
+    # we can use a buildkite_deps.txt file to capture requirements
+    buildkite_deps_txt = Path(directory) / "buildkite_deps.txt"
+    if buildkite_deps_txt.exists():
+        return frozenset(pkg_resources.parse_requirements(buildkite_deps_txt.read_text()))
+
+    # Otherwise return nothing
+    return frozenset()
+
+
+# Every package checks whether any changed file lives under its directory, so index the
+# ancestors of the changed files once instead of rescanning the changeset per package.
+@functools.lru_cache(maxsize=None)
+def _directories_with_changes() -> FrozenSet[Path]:
+    return frozenset(
+        directory
+        for change in ChangedFiles.all
+        # The file can alter behavior - exclude things like README changes
+        # which we tend to include in .md files
+        if change.name.endswith(changed_filetypes)
+        for directory in change.parents
+    )
+
+
 PytestExtraCommandsFunction: TypeAlias = Callable[
     [AvailablePythonVersion, Optional[str]], List[str]
 ]
@@ -143,6 +178,8 @@ def build_steps(self) -> List[BuildkiteTopLevelStep]:
 
         if self.run_pytest:
             default_python_versions = AvailablePythonVersion.get_pytest_defaults()
+            # Resolve this once rather than for every generated step
+            skip_reason = self.skip_reason
 
             tox_factors: List[Optional[str]] = (
                 [f.lstrip("-") for f in self.pytest_tox_factors]
@@ -156,17 +193,16 @@ def build_steps(self) -> List[BuildkiteTopLevelStep]:
                 else:
                     unsupported_python_versions = self.unsupported_python_versions or []
 
-                supported_python_versions = [
-                    v
-                    for v in AvailablePythonVersion.get_all()
-                    if v not in unsupported_python_versions
-                ]
-
                 pytest_python_versions = sorted(
-                    list(set(default_python_versions) - set(unsupported_python_versions))
+                    set(default_python_versions).difference(unsupported_python_versions)
                 )
                 # Use highest supported python version if no defaults_match
                 if len(pytest_python_versions) == 0:
+                    supported_python_versions = [
+                        v
+                        for v in AvailablePythonVersion.get_all()
+                        if v not in unsupported_python_versions
+                    ]
                     pytest_python_versions = [supported_python_versions[-1]]
 
                 for py_version in pytest_python_versions:
@@ -184,7 +220,7 @@ def build_steps(self) -> List[BuildkiteTopLevelStep]:
                         extra_commands_pre = []
 
                     dependencies = []
-                    if not self.skip_reason:
+                    if not skip_reason:
                         if isinstance(self.pytest_step_dependencies, list):
                             dependencies = self.pytest_step_dependencies
                         elif callable(self.pytest_step_dependencies):
@@ -204,7 +240,7 @@ def build_steps(self) -> List[BuildkiteTopLevelStep]:
                             timeout_in_minutes=self.timeout_in_minutes,
                             queue=self.queue,
                             retries=self.retries,
-                            skip_reason=self.skip_reason,
+                            skip_reason=skip_reason,
                         )
                     )
 
@@ -227,20 +263,7 @@ def build_steps(self) -> List[BuildkiteTopLevelStep]:
 
     @property
     def requirements(self):
-        # First try to infer requirements from the python package
-        package = PythonPackages.get(self.name)
-        if package:
-            return set.union(package.install_requires, *package.extras_require.values())
-
-        # If we don't have a distribution (like many of our integration test suites)
-        # we can use a buildkite_deps.txt file to capture requirements
-        buildkite_deps_txt = Path(self.directory) / "buildkite_deps.txt"
-        if buildkite_deps_txt.exists():
-            parsed = pkg_resources.parse_requirements(buildkite_deps_txt.read_text())
-            return [requirement for requirement in parsed]
-
-        # Otherwise return nothing
-        return []
+        return _requirements(self.name, self.directory)
 
     @property
     def skip_reason(self) -> Optional[str]:
@@ -260,22 +283,16 @@ def skip_reason(self) -> Optional[str]:
             self._should_skip = False
             return None
 
-        if not is_feature_branch(os.getenv("BUILDKITE_BRANCH", "")):
+        if not is_feature_branch():
             logging.info(f"Building {self.name} we're not on a feature branch")
             self._should_skip = False
             return None
 
-        for change in ChangedFiles.all:
-            if (
-                # Our change is in this package's directory
-                (Path(self.directory) in change.parents)
-                # The file can alter behavior - exclude things like README changes
-                # which we tend to include in .md files
-                and change.suffix in changed_filetypes
-            ):
-                logging.info(f"Building {self.name} because it has changed")
-                self._should_skip = False
-                return None
+        # Our change is in this package's directory
+        if Path(self.directory) in _directories_with_changes():
+            logging.info(f"Building {self.name} because it has changed")
+            self._should_skip = False
+            return None
 
         # Consider anything required by install or an extra to be in scope.
         # We might one day narrow this down to specific extras.
@@ -1,3 +1,4 @@
+import functools
 import os
 import re
 from typing import List, Optional
@@ -74,6 +75,14 @@ def _get_setting(name: str) -> Optional[str]:
     commit_message = safe_getenv("BUILDKITE_MESSAGE")
     if direct_specifier:
         return direct_specifier
+    # Most commit messages don't specify any settings, so avoid a regex scan of the whole message
+    elif f"[{name}=" not in commit_message:
+        return None
     else:
-        m = re.search(r"\[" + name + r"=(\S+)\]", commit_message)
+        m = _setting_pattern(name).search(commit_message)
         return m.group(1) if m else None
+
+
+@functools.lru_cache(maxsize=None)
+def _setting_pattern(name: str) -> "re.Pattern[str]":
+    return re.compile(r"\[" + re.escape(name) + r"=(\S+)\]")
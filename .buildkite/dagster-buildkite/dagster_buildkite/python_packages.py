@@ -1,29 +1,124 @@
 # pyright: reportUnnecessaryTypeIgnoreComment=false
 
+import ast
+import contextlib
+import functools
+import hashlib
+import json
 import logging
 import os
 import subprocess
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from distutils import core as distutils_core
 from importlib import reload
+from itertools import chain
+from operator import attrgetter
 from pathlib import Path
-from typing import Dict, Optional, Set
+from typing import (
+    AbstractSet,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 from pkg_resources import Requirement, parse_requirements
 
 from dagster_buildkite.git import ChangedFiles, GitInfo
 
-changed_filetypes = [".py", ".cfg", ".toml", ".yaml", ".ipynb", ".yml", ".ini", ".jinja"]
-
-
-def _path_is_relative_to(p: Path, u: Path) -> bool:
-    # see https://docs.python.org/3/library/pathlib.html#pathlib.PurePath.is_relative_to
-    return u == p or u in p.parents
+# Running every setup.py is the slowest part of generating the pipeline, but their metadata only
+# changes when a setup.py does. Keep the results between pipeline uploads on the same agent.
+_PACKAGES_CACHE_PATH = Path(os.path.expanduser("~/.cache/dagster-buildkite/packages.json"))
+# Bump whenever the shape of the cached data changes
+_PACKAGES_CACHE_VERSION = 1
+
+# A tuple so that membership can be tested with a single `str.endswith` call
+changed_filetypes = (".py", ".cfg", ".toml", ".yaml", ".ipynb", ".yml", ".ini", ".jinja")
+
+
+def _normalize_name(name: str) -> str:
+    # We're inconsistent about whether we use dashes or underscores and we
+    # get away with it because pip normalizes package names. So mimic that
+    # behavior.
+    return name.replace("_", "-").lower()
+
+
+def _parse_requirements(requirements: Union[str, Iterable[str]]) -> Iterator[Requirement]:
+    if isinstance(requirements, str):
+        requirements = [requirements]
+    for requirement in requirements:
+        yield from _parse_requirement(requirement)
+
+
+# Most packages repeat the same requirement strings (`dagster`, `dagster-pipes`, ...), so share
+# parsed requirements across packages instead of re-running the parser for every occurrence
+@functools.lru_cache(maxsize=None)
+def _parse_requirement(requirement: str) -> Tuple[Requirement, ...]:
+    return tuple(parse_requirements(requirement))
+
+
+_SETUP_KWARGS = ("name", "install_requires", "extras_require")
+# Anything ast.parse or ast.literal_eval can raise on source they can't handle, e.g. an unhashable
+# set member or a deeply nested expression
+_LITERAL_EVAL_ERRORS = (ValueError, TypeError, SyntaxError, MemoryError, RecursionError)
+
+
+# Read the metadata we need straight from the `setup(...)` call in a setup.py, without executing
+# it. Returns None unless there's exactly one call and every kwarg we need is a literal, in which
+# case the caller should fall back to running the setup.py.
+def _literal_setup_kwargs(setup_py_path: Path) -> Optional[Dict[str, object]]:
+    try:
+        tree = ast.parse(setup_py_path.read_text(encoding="utf8"), filename=str(setup_py_path))
+    except _LITERAL_EVAL_ERRORS:
+        return None
+    calls = [
+        node
+        for node in ast.walk(tree)
+        if isinstance(node, ast.Call) and getattr(node.func, "id", None) == "setup"
+    ]
+    if len(calls) != 1 or calls[0].args:
+        return None
+
+    keywords = {keyword.arg: keyword.value for keyword in calls[0].keywords}
+    # `setup(**kwargs)` could supply or override anything
+    if None in keywords or "name" not in keywords:
+        return None
+
+    setup_kwargs = {}
+    for kwarg in _SETUP_KWARGS:
+        if kwarg in keywords:
+            try:
+                setup_kwargs[kwarg] = ast.literal_eval(keywords[kwarg])
+            except _LITERAL_EVAL_ERRORS:
+                return None
+    return setup_kwargs
 
 
 class PythonPackage:
-    def __init__(self, setup_py_path: Path):
+    def __init__(self, setup_py_path: Path, cached: Optional[Mapping] = None):
         self.directory = setup_py_path.parent
 
+        # Metadata saved by a previous pipeline upload (see `to_cache`)
+        if cached is not None:
+            self.name = cached["name"]
+            self._install_requires = cached["install_requires"]
+            self._extras_require = cached["extras_require"]
+            return
+
+        setup_kwargs = _literal_setup_kwargs(setup_py_path)
+        if setup_kwargs is not None:
+            self.name = setup_kwargs["name"]
+            self._install_requires = setup_kwargs.get("install_requires", [])
+            self._extras_require = setup_kwargs.get("extras_require", {})
+            return
+
         # run_setup stores state in a global variable. Reload the module
         # each time we use it - otherwise we'll get the previous invocation's
         # distribution if our setup.py doesn't implement setup() correctly
@@ -34,21 +129,38 @@ def __init__(self, setup_py_path: Path):
         self._extras_require = distribution.extras_require  # type: ignore[attr-defined]
         self.name = distribution.get_name()
 
-    @property
-    def install_requires(self) -> Set[Requirement]:
-        return set(
+    def to_cache(self) -> Dict:
+        # setup() accepts a string or any iterable of strings for requirements; store them in a
+        # form that survives a round trip through JSON
+        def _serialize(requirements):
+            return requirements if isinstance(requirements, str) else list(requirements or [])
+
+        return {
+            "name": self.name,
+            "install_requires": _serialize(self._install_requires),
+            "extras_require": {
+                extra: _serialize(requirements)
+                for extra, requirements in (self._extras_require or {}).items()
+            },
+        }
+
+    # Requirements are parsed lazily (in-repo packages must be loaded first to filter them), but
+    # are walked for every package that depends on this one, so only parse them once.
+    @functools.cached_property
+    def install_requires(self) -> FrozenSet[Requirement]:
+        return frozenset(
             requirement
-            for requirement in parse_requirements(self._install_requires)
+            for requirement in _parse_requirements(self._install_requires)
             if PythonPackages.get(requirement.name)  # type: ignore[attr-defined]
         )
 
-    @property
-    def extras_require(self) -> Dict[str, Set[Requirement]]:
+    @functools.cached_property
+    def extras_require(self) -> Mapping[str, FrozenSet[Requirement]]:
         extras_require = {}
         for extra, requirements in self._extras_require.items():
-            extras_require[extra] = set(
+            extras_require[extra] = frozenset(
                 requirement
-                for requirement in parse_requirements(requirements)
+                for requirement in _parse_requirements(requirements)
                 if PythonPackages.get(requirement.name)  # type: ignore[attr-defined]
             )
         return extras_require
@@ -74,39 +186,60 @@ def __lt__(self, other):
 class PythonPackages:
     _repositories: Set[Path] = set()
     all: Dict[str, PythonPackage] = dict()
+    _by_normalized_name: Dict[str, PythonPackage] = dict()
     with_changes: Set[PythonPackage] = set()
+    _dependencies: Dict[Tuple[str, FrozenSet[str]], FrozenSet[PythonPackage]] = dict()
 
     @classmethod
     def get(cls, name: str) -> Optional[PythonPackage]:
-        # We're inconsistent about whether we use dashes or undrescores and we
-        # get away with it because pip converts all underscores to dashes. So
-        # mimic that behavior.
-        return (
-            cls.all.get(name)
-            or cls.all.get(name.replace("_", "-"))
-            or cls.all.get(name.replace("-", "_"))
-        )
+        return cls._by_normalized_name.get(_normalize_name(name))
 
     @classmethod
-    def walk_dependencies(cls, requirement: Requirement) -> Set[PythonPackage]:
-        dependencies: Set[PythonPackage] = set()
-        dagster_package = cls.get(requirement.name)  # type: ignore[attr-defined]
-
-        # Return early if it's not a dependency defined in our repo
-        if not dagster_package:
-            return dependencies
-
-        # Add the dagster package
-        dependencies.add(dagster_package)
+    def walk_dependencies(cls, requirement: Requirement) -> AbstractSet[PythonPackage]:
+        # Most packages share the same transitive dependency graph, so only walk it once for
+        # each requirement name and set of extras. Keying on the requirement rather than the
+        # resolved package lets cache hits (including for third-party requirements) skip `get`.
+        key = (requirement.name, frozenset(requirement.extras))  # type: ignore[attr-defined]
+        if key not in cls._dependencies:
+            dagster_package = cls.get(requirement.name)  # type: ignore[attr-defined]
+
+            # Nothing to walk if it's not a dependency defined in our repo
+            cls._dependencies[key] = (
+                frozenset(cls._walk_dependencies(dagster_package, requirement.extras))
+                if dagster_package
+                else frozenset()
+            )
+        return cls._dependencies[key]
 
-        # Walk the tree for any extras we require
-        for extra in requirement.extras:
-            for req in dagster_package.extras_require.get(extra, set()):
-                dependencies.update(cls.walk_dependencies(req))
+    @classmethod
+    def _walk_dependencies(
+        cls, dagster_package: PythonPackage, extras: Iterable[str]
+    ) -> Set[PythonPackage]:
+        dependencies: Set[PythonPackage] = set()
 
-        # Walk the tree for anything our dagster package's install requires
-        for req in dagster_package.install_requires:
-            dependencies.update(cls.walk_dependencies(req))
+        # Walk the tree with a worklist rather than recursing, so that every (package, extras)
+        # node is only expanded once even when subtrees are shared (or cyclic)
+        visited: Set[Tuple[PythonPackage, FrozenSet[str]]] = set()
+        queue = deque([(dagster_package, frozenset(extras))])
+        while queue:
+            node = queue.popleft()
+            if node in visited:
+                continue
+            visited.add(node)
+            package, package_extras = node
+
+            # Add the dagster package
+            dependencies.add(package)
+
+            # Walk the tree for any extras we require, and for anything our dagster package's
+            # install requires
+            for req in chain(
+                *(package.extras_require.get(extra, frozenset()) for extra in package_extras),
+                package.install_requires,
+            ):
+                dependency = cls.get(req.name)  # type: ignore[attr-defined]
+                if dependency:
+                    queue.append((dependency, frozenset(req.extras)))  # type: ignore[attr-defined]
 
         return dependencies
 
@@ -116,41 +249,116 @@ def load_from_git(cls, git_info: GitInfo) -> None:
         if git_info.directory in cls._repositories:
             return None
 
-        ChangedFiles.load_from_git(git_info)
+        # Discovering packages doesn't depend on the changeset, so let the base branch fetch
+        # run in the background while we run every setup.py
+        ChangedFiles.start_fetch(git_info)
 
         logging.info("Finding Python packages:")
 
-        # Consider any setup.py file to be a package
+        # Consider any setup.py file to be a package. Let git match them with a pathspec
+        # (wildcards match across directories) instead of listing the whole tree.
         output = subprocess.check_output(
-            ["git", "ls-files", "."],
+            ["git", "ls-files", "-z", "--", "setup.py", "*/setup.py"],
             cwd=str(git_info.directory),
-        ).decode("utf-8")
-        packages = [
-            PythonPackage(git_info.directory / Path(file))
-            for file in output.split("\n")
-            if os.path.basename(file) == "setup.py"
-        ]
-
-        for package in sorted(packages):
+        )
+        setup_py_files = [os.fsdecode(entry) for entry in output.split(b"\0") if entry]
+        setup_py_paths = [git_info.directory / file for file in setup_py_files]
+
+        cache_key = _packages_cache_key(setup_py_files, setup_py_paths)
+        packages = _load_cached_packages(git_info.directory, cache_key) if cache_key else None
+        if packages is None:
+            # Running every setup.py dominates loading, and they're independent of each other.
+            # run_setup relies on module-level state, so fan out across processes, not threads.
+            with ProcessPoolExecutor() as executor:
+                packages = list(executor.map(PythonPackage, setup_py_paths, chunksize=4))
+            if cache_key:
+                _save_cached_packages(git_info.directory, cache_key, packages)
+
+        # Sort on the name directly so that comparisons don't dispatch to PythonPackage.__lt__
+        for package in sorted(packages, key=attrgetter("name")):
             logging.info("  - " + package.name)
             cls.all[package.name] = package
+            cls._by_normalized_name[_normalize_name(package.name)] = package
+
+        ChangedFiles.load_from_git(git_info)
 
         packages_with_changes: Set[PythonPackage] = set()
 
         logging.info("Finding changed packages:")
-        for package in packages:
-            for change in ChangedFiles.all:
-                if (
-                    # Our change is in this package's directory
-                    _path_is_relative_to(change, package.directory)
-                    # The file can alter behavior - exclude things like README changes
-                    and (change.suffix in changed_filetypes)
-                    # The file is not part of a test suite. We treat this differently
-                    # because we don't want to run tests in dependent packages
-                    and "_tests/" not in str(change)
-                ):
-                    packages_with_changes.add(package)
-
-        for package in sorted(packages_with_changes):
+        # Rather than testing every change against every package, look up each change's
+        # ancestors in an index of package directories
+        packages_by_directory = {package.directory: package for package in packages}
+        for change in ChangedFiles.all:
+            if (
+                # The file can alter behavior - exclude things like README changes
+                change.name.endswith(changed_filetypes)
+                # The file is not part of a test suite. We treat this differently
+                # because we don't want to run tests in dependent packages
+                and "_tests/" not in change.as_posix()
+            ):
+                # Our change is in this package's directory
+                for directory in (change, *change.parents):
+                    package = packages_by_directory.get(directory)
+                    if package:
+                        packages_with_changes.add(package)
+
+        for package in sorted(packages_with_changes, key=attrgetter("name")):
             logging.info("  - " + package.name)
             cls.with_changes.add(package)
+
+        cls._repositories.add(git_info.directory)
+
+
+# Key the cache on the working tree contents of every setup.py rather than on the index, so
+# that unstaged local edits are picked up. Returns None (don't use the cache) if any of them
+# can't be read.
+def _packages_cache_key(setup_py_files: List[str], setup_py_paths: List[Path]) -> Optional[str]:
+    digest = hashlib.sha256()
+    for file, path in zip(setup_py_files, setup_py_paths):
+        try:
+            contents = path.read_bytes()
+        except OSError:
+            return None
+        digest.update(os.fsencode(file) + b"\0")
+        digest.update(hashlib.sha256(contents).digest())
+    return digest.hexdigest()
+
+
+def _load_cached_packages(directory: Path, cache_key: str) -> Optional[List[PythonPackage]]:
+    # The cache is only an optimization, so treat anything unexpected in it as a miss and fall
+    # back to running every setup.py
+    try:
+        cache = json.loads(_PACKAGES_CACHE_PATH.read_text())
+        if cache["version"] != _PACKAGES_CACHE_VERSION or cache["key"] != cache_key:
+            return None
+        packages = [
+            PythonPackage(directory / package_directory / "setup.py", data)
+            for package_directory, data in cache["packages"].items()
+        ]
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+    logging.info(f"Using cached Python packages from {_PACKAGES_CACHE_PATH}")
+    return packages
+
+
+def _save_cached_packages(directory: Path, cache_key: str, packages: List[PythonPackage]) -> None:
+    cache = {
+        "version": _PACKAGES_CACHE_VERSION,
+        "key": cache_key,
+        "packages": {
+            os.path.relpath(package.directory, directory): package.to_cache()
+            for package in packages
+        },
+    }
+    # The cache is only an optimization, so never fail the pipeline over it. Write to a temporary
+    # file and move it into place so a concurrent or interrupted upload never sees half a cache.
+    temp_path = _PACKAGES_CACHE_PATH.with_name(f"{_PACKAGES_CACHE_PATH.name}.{os.getpid()}.tmp")
+    try:
+        _PACKAGES_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        temp_path.write_text(json.dumps(cache))
+        os.replace(temp_path, _PACKAGES_CACHE_PATH)
+    except OSError:
+        with contextlib.suppress(OSError):
+            temp_path.unlink()
+        logging.warning(f"Unable to write Python package cache to {_PACKAGES_CACHE_PATH}")
@@ -1,6 +1,7 @@
+import functools
 import os
 from enum import Enum
-from typing import List
+from typing import List, Tuple
 
 from dagster_buildkite.utils import is_release_branch, safe_getenv
 
@@ -23,10 +24,17 @@ def get_default(cls) -> "AvailablePythonVersion":
 
     @classmethod
     def get_pytest_defaults(cls) -> List["AvailablePythonVersion"]:
+        return list(cls._get_pytest_defaults())
+
+    # The defaults only depend on environment variables that are fixed for the whole build, but
+    # are requested for every package spec, so resolve them once.
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _get_pytest_defaults(cls) -> Tuple["AvailablePythonVersion", ...]:
         branch_name = safe_getenv("BUILDKITE_BRANCH")
         commit_message = safe_getenv("BUILDKITE_MESSAGE")
         if is_release_branch(branch_name):
-            return cls.get_all()
+            return tuple(cls.get_all())
         else:
             # environment variable-specified defaults
             # branch name or commit message-specified defaults
@@ -43,9 +51,9 @@ def get_pytest_defaults(cls) -> List["AvailablePythonVersion"]:
                 specified_versions += cls.get_all()
 
             return (
-                list(set(specified_versions))
+                tuple(set(specified_versions))
                 if len(specified_versions) > 0
-                else [cls.get_default()]
+                else (cls.get_default(),)
             )
 
     @classmethod
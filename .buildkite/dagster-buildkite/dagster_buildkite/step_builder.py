@@ -1,3 +1,4 @@
+import functools
 import os
 from enum import Enum
 from typing import Dict, List, Optional
@@ -16,6 +17,14 @@
 AWS_ECR_REGION = "us-west-2"
 
 
+# Pass through all BUILDKITE* and CI* envvars so our test analytics are properly tagged. The
+# environment doesn't change while we generate the pipeline, so only scan it once rather than
+# once per step.
+@functools.lru_cache(maxsize=None)
+def _buildkite_env_vars() -> List[str]:
+    return [env for env in os.environ if env.startswith(("BUILDKITE", "CI_"))]
+
+
 class BuildkiteQueue(Enum):
     DOCKER = safe_getenv("BUILDKITE_DOCKER_QUEUE")
     MEDIUM = safe_getenv("BUILDKITE_MEDIUM_QUEUE")
@@ -74,13 +83,6 @@ def on_python_image(self, image: str, env: Optional[List[str]] = None) -> "Comma
         settings["volumes"] = ["/var/run/docker.sock:/var/run/docker.sock", "/tmp:/tmp"]
         settings["network"] = "kind"
 
-        # Pass through all BUILDKITE* and CI* envvars so our test analytics are properly tagged
-        buildkite_envvars = [
-            env
-            for env in list(os.environ.keys())
-            if env.startswith("BUILDKITE") or env.startswith("CI_")
-        ]
-
         # Set PYTEST_DEBUG_TEMPROOT to our mounted /tmp volume. Any time the
         # pytest `tmp_path` or `tmpdir` fixtures are used used, the temporary
         # path they return will be nested under /tmp.
@@ -89,7 +91,7 @@ def on_python_image(self, image: str, env: Optional[List[str]] = None) -> "Comma
             [
                 "PYTEST_DEBUG_TEMPROOT=/tmp",
             ]
-            + buildkite_envvars
+            + _buildkite_env_vars()
             + (env or [])
         )
         ecr_settings = {
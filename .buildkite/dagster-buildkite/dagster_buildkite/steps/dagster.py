@@ -91,7 +91,6 @@ def build_repo_wide_prettier_steps() -> List[CommandStep]:
 
 
 def build_check_changelog_steps() -> List[CommandStep]:
-    branch_name = safe_getenv("BUILDKITE_BRANCH")
     if not is_release_branch(branch_name):
         return []
 
@@ -144,16 +143,13 @@ def build_repo_wide_check_manifest_steps() -> List[CommandStep]:
         *(
             os.path.relpath(p, GIT_REPO_ROOT)
             for p in glob(f"{GIT_REPO_ROOT}/python_modules/libraries/*")
+            if not p.endswith("CONTRIBUTING.md")  # ignore md file in dir
         ),
     ]
 
     commands = [
         "pip install check-manifest",
-        *(
-            f"check-manifest {library}"
-            for library in published_packages
-            if not library.endswith("CONTRIBUTING.md")  # ignore md file in dir
-        ),
+        *(f"check-manifest {library}" for library in published_packages),
     ]
 
     return [
@@ -195,22 +191,20 @@ def build_graphql_python_client_backcompat_steps() -> List[CommandStep]:
 
 
 def skip_mysql_if_no_changes_to_dependencies(dependencies: List[str]):
-    if not is_feature_branch():
+    if not is_feature_branch() or _has_changes_to_dependencies(dependencies):
         return None
 
-    for dependency in dependencies:
-        if PythonPackages.get(dependency) in PythonPackages.with_changes:
-            return None
-
     return "Skip unless mysql schemas might have changed"
 
 
 def skip_graphql_if_no_changes_to_dependencies(dependencies: List[str]):
-    if not is_feature_branch():
+    if not is_feature_branch() or _has_changes_to_dependencies(dependencies):
         return None
 
-    for dependency in dependencies:
-        if PythonPackages.get(dependency) in PythonPackages.with_changes:
-            return None
-
     return "Skip unless GraphQL schemas might have changed"
+
+
+def _has_changes_to_dependencies(dependencies: List[str]) -> bool:
+    return not PythonPackages.with_changes.isdisjoint(
+        PythonPackages.get(dependency) for dependency in dependencies
+    )
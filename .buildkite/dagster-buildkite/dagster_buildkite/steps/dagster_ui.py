@@ -14,10 +14,8 @@ def skip_if_no_dagster_ui_components_changes():
         return None
 
     # If anything changes in the ui-components directory
-    if any(
-        Path("js_modules/dagster-ui/packages/ui-components") in path.parents
-        for path in ChangedFiles.all
-    ):
+    ui_components = Path("js_modules/dagster-ui/packages/ui-components")
+    if any(ui_components in path.parents for path in ChangedFiles.all):
         return None
 
     return "No changes that affect the ui-components JS library"
@@ -42,7 +40,8 @@ def skip_if_no_dagster_ui_core_changes():
         return None
 
     # If anything changes in the js_modules directory
-    if any(Path("js_modules") in path.parents for path in ChangedFiles.all):
+    js_modules = Path("js_modules")
+    if any(js_modules in path.parents for path in ChangedFiles.all):
         return None
 
     # If anything changes in python packages that our front end depend on
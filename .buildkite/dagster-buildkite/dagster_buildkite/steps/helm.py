@@ -49,6 +49,11 @@ def build_helm_steps() -> List[BuildkiteStep]:
 
 
 def _build_lint_steps(package_spec) -> List[CommandStep]:
+    # Every lint step combines the same two skip decisions, so make each of them (and log the
+    # reason) only once. Between the `and`s and the `or` below, both are always consulted anyway.
+    no_helm_changes = skip_if_no_helm_changes()
+    skip_reason = package_spec.skip_reason
+    default_python = AvailablePythonVersion.get_default()
     return [
         CommandStepBuilder("dagster-json-schema")
         .run(
@@ -56,15 +61,15 @@ def _build_lint_steps(package_spec) -> List[CommandStep]:
             "dagster-helm schema apply",
             "git diff --exit-code",
         )
-        .with_skip(skip_if_no_helm_changes() and package_spec.skip_reason)
-        .on_test_image(AvailablePythonVersion.get_default())
+        .with_skip(no_helm_changes and skip_reason)
+        .on_test_image(default_python)
         .build(),
         CommandStepBuilder(":lint-roller: dagster")
         .run(
             "helm lint helm/dagster --with-subcharts --strict",
         )
-        .with_skip(skip_if_no_helm_changes() or package_spec.skip_reason)
-        .on_test_image(AvailablePythonVersion.get_default())
+        .with_skip(no_helm_changes or skip_reason)
+        .on_test_image(default_python)
         .with_retry(2)
         .build(),
         CommandStepBuilder("dagster dependency build")
@@ -74,7 +79,7 @@ def _build_lint_steps(package_spec) -> List[CommandStep]:
             " https://raw.githubusercontent.com/bitnami/charts/eb5f9a9513d987b519f0ecd732e7031241c50328/bitnami",
             "helm dependency build helm/dagster",
         )
-        .with_skip(skip_if_no_helm_changes() and package_spec.skip_reason)
-        .on_test_image(AvailablePythonVersion.get_default())
+        .with_skip(no_helm_changes and skip_reason)
+        .on_test_image(default_python)
         .build(),
     ]
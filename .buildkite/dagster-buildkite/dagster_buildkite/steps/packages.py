@@ -1,7 +1,8 @@
+import functools
 import os
-from glob import glob
+from itertools import chain
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import FrozenSet, Iterable, List, Optional, Tuple
 
 from dagster_buildkite.defines import GCP_CREDS_FILENAME, GCP_CREDS_LOCAL_FILE, GIT_REPO_ROOT
 from dagster_buildkite.package_spec import PackageSpec
@@ -16,39 +17,36 @@
 
 
 def build_example_packages_steps() -> List[BuildkiteStep]:
-    custom_example_pkg_roots = [pkg.directory for pkg in EXAMPLE_PACKAGES_WITH_CUSTOM_CONFIG]
-    example_packages_with_standard_config = [
-        PackageSpec(pkg)
-        for pkg in (
-            _get_uncustomized_pkg_roots("examples", custom_example_pkg_roots)
-            + _get_uncustomized_pkg_roots("examples/experimental", custom_example_pkg_roots)
-        )
-    ]
-
-    example_packages = EXAMPLE_PACKAGES_WITH_CUSTOM_CONFIG + example_packages_with_standard_config
+    custom_example_pkg_roots = frozenset(
+        pkg.directory for pkg in _example_packages_with_custom_config()
+    )
+    example_packages = chain(
+        _example_packages_with_custom_config(),
+        (
+            PackageSpec(pkg)
+            for root in ("examples", "examples/experimental")
+            for pkg in _get_uncustomized_pkg_roots(root, custom_example_pkg_roots)
+        ),
+    )
 
     return build_steps_from_package_specs(example_packages)
 
 
 def build_library_packages_steps() -> List[BuildkiteStep]:
-    custom_library_pkg_roots = [pkg.directory for pkg in LIBRARY_PACKAGES_WITH_CUSTOM_CONFIG]
-    library_packages_with_standard_config = [
-        *[
-            PackageSpec(pkg)
-            for pkg in _get_uncustomized_pkg_roots("python_modules", custom_library_pkg_roots)
-        ],
-        *[
+    custom_library_pkg_roots = frozenset(
+        pkg.directory for pkg in _library_packages_with_custom_config()
+    )
+    library_packages = chain(
+        _library_packages_with_custom_config(),
+        (
             PackageSpec(pkg)
-            for pkg in _get_uncustomized_pkg_roots(
-                "python_modules/libraries", custom_library_pkg_roots
-            )
-        ],
-    ]
-
-    return build_steps_from_package_specs(
-        LIBRARY_PACKAGES_WITH_CUSTOM_CONFIG + library_packages_with_standard_config
+            for root in ("python_modules", "python_modules/libraries")
+            for pkg in _get_uncustomized_pkg_roots(root, custom_library_pkg_roots)
+        ),
     )
 
+    return build_steps_from_package_specs(library_packages)
+
 
 def build_dagster_ui_screenshot_steps() -> List[BuildkiteStep]:
     return build_steps_from_package_specs(
@@ -56,11 +54,11 @@ def build_dagster_ui_screenshot_steps() -> List[BuildkiteStep]:
     )
 
 
-def build_steps_from_package_specs(package_specs: List[PackageSpec]) -> List[BuildkiteStep]:
+def build_steps_from_package_specs(package_specs: Iterable[PackageSpec]) -> List[BuildkiteStep]:
     steps: List[BuildkiteStep] = []
     all_packages = sorted(
         package_specs,
-        key=lambda p: f"{_PACKAGE_TYPE_ORDER.index(p.package_type)} {p.name}",  # type: ignore[arg-type]
+        key=lambda p: (_PACKAGE_TYPE_RANK[p.package_type], p.name),  # type: ignore[index]
     )
 
     for pkg in all_packages:
@@ -70,16 +68,29 @@ def build_steps_from_package_specs(package_specs: List[PackageSpec]) -> List[Bui
 
 
 _PACKAGE_TYPE_ORDER = ["core", "extension", "example", "infrastructure", "unknown"]
-
-
-# Find packages under a root subdirectory that are not configured above.
-def _get_uncustomized_pkg_roots(root, custom_pkg_roots) -> List[str]:
-    all_files_in_root = [
-        os.path.relpath(p, GIT_REPO_ROOT) for p in glob(os.path.join(GIT_REPO_ROOT, root, "*"))
-    ]
-    return [
-        p for p in all_files_in_root if p not in custom_pkg_roots and os.path.exists(f"{p}/tox.ini")
-    ]
+# Rank lookups for sorting, rather than scanning the list for every package
+_PACKAGE_TYPE_RANK = {package_type: i for i, package_type in enumerate(_PACKAGE_TYPE_ORDER)}
+
+
+# Find packages under a root subdirectory that are not configured above. The tree doesn't change
+# while we generate the pipeline, so only scan each root once.
+@functools.lru_cache(maxsize=None)
+def _get_uncustomized_pkg_roots(root: str, custom_pkg_roots: FrozenSet[str]) -> Tuple[str, ...]:
+    pkg_roots = []
+    # scandir already knows which entries are directories, so only stat for a tox.ini in those
+    with os.scandir(os.path.join(GIT_REPO_ROOT, root)) as entries:
+        for entry in entries:
+            # Match glob("*"), which skips hidden entries
+            if entry.name.startswith(".") or not entry.is_dir():
+                continue
+            # Entries are direct children of the root, so there's no need for relpath's
+            # normalization to recover the repo-relative path
+            pkg_root = os.path.join(root, entry.name)
+            if pkg_root not in custom_pkg_roots and os.path.exists(
+                os.path.join(entry.path, "tox.ini")
+            ):
+                pkg_roots.append(pkg_root)
+    return tuple(pkg_roots)
 
 
 # ########################
@@ -266,93 +277,95 @@ def k8s_extra_cmds(version: str, _) -> List[str]:
 
 # Some Dagster packages have more involved test configs or support only certain Python version;
 # special-case those here
-EXAMPLE_PACKAGES_WITH_CUSTOM_CONFIG: List[PackageSpec] = [
-    PackageSpec(
-        "examples/with_airflow",
-        unsupported_python_versions=[
-            AvailablePythonVersion.V3_9,
-            AvailablePythonVersion.V3_10,
-            AvailablePythonVersion.V3_11,
-            AvailablePythonVersion.V3_12,
-        ],
-    ),
-    PackageSpec(
-        "examples/assets_smoke_test",
-    ),
-    PackageSpec(
-        "examples/deploy_docker",
-        pytest_extra_cmds=deploy_docker_example_extra_cmds,
-    ),
-    PackageSpec(
-        "examples/docs_snippets",
-        pytest_extra_cmds=docs_snippets_extra_cmds,
-        unsupported_python_versions=[
-            # dependency on 3.9-incompatible extension libs
-            AvailablePythonVersion.V3_9,
-            # dagster-airflow dep
-            AvailablePythonVersion.V3_12,
-        ],
-    ),
-    PackageSpec(
-        "examples/project_fully_featured",
-        unsupported_python_versions=[
-            AvailablePythonVersion.V3_12,  # duckdb
-        ],
-    ),
-    PackageSpec(
-        "examples/with_great_expectations",
-    ),
-    PackageSpec(
-        "examples/with_pyspark",
-    ),
-    PackageSpec(
-        "examples/with_pyspark_emr",
-    ),
-    PackageSpec(
-        "examples/with_wandb",
-        unsupported_python_versions=[
-            # dagster-wandb dep
-            AvailablePythonVersion.V3_12,
-        ],
-    ),
-    # The 6 tutorials referenced in cloud onboarding cant test "source" due to dagster-cloud dep
-    PackageSpec(
-        "examples/assets_modern_data_stack",
-        pytest_tox_factors=["pypi"],
-    ),
-    PackageSpec(
-        "examples/assets_dbt_python",
-        pytest_tox_factors=["pypi"],
-        unsupported_python_versions=[
-            AvailablePythonVersion.V3_12,  # duckdb
-        ],
-    ),
-    PackageSpec(
-        "examples/assets_dynamic_partitions",
-        unsupported_python_versions=[
-            AvailablePythonVersion.V3_12,  # duckdb
-        ],
-    ),
-    PackageSpec(
-        "examples/quickstart_aws",
-        pytest_tox_factors=["pypi"],
-    ),
-    PackageSpec(
-        "examples/quickstart_etl",
-        pytest_tox_factors=["pypi"],
-    ),
-    PackageSpec(
-        "examples/quickstart_gcp",
-        pytest_tox_factors=["pypi"],
-    ),
-    PackageSpec(
-        "examples/quickstart_snowflake",
-        pytest_tox_factors=["pypi"],
-    ),
-    PackageSpec(
-        "examples/experimental/dagster-blueprints",
-    ),
-]
+@functools.lru_cache(maxsize=None)
+def _example_packages_with_custom_config() -> Tuple[PackageSpec, ...]:
+    return (
+        PackageSpec(
+            "examples/with_airflow",
+            unsupported_python_versions=[
+                AvailablePythonVersion.V3_9,
+                AvailablePythonVersion.V3_10,
+                AvailablePythonVersion.V3_11,
+                AvailablePythonVersion.V3_12,
+            ],
+        ),
+        PackageSpec(
+            "examples/assets_smoke_test",
+        ),
+        PackageSpec(
+            "examples/deploy_docker",
+            pytest_extra_cmds=deploy_docker_example_extra_cmds,
+        ),
+        PackageSpec(
+            "examples/docs_snippets",
+            pytest_extra_cmds=docs_snippets_extra_cmds,
+            unsupported_python_versions=[
+                # dependency on 3.9-incompatible extension libs
+                AvailablePythonVersion.V3_9,
+                # dagster-airflow dep
+                AvailablePythonVersion.V3_12,
+            ],
+        ),
+        PackageSpec(
+            "examples/project_fully_featured",
+            unsupported_python_versions=[
+                AvailablePythonVersion.V3_12,  # duckdb
+            ],
+        ),
+        PackageSpec(
+            "examples/with_great_expectations",
+        ),
+        PackageSpec(
+            "examples/with_pyspark",
+        ),
+        PackageSpec(
+            "examples/with_pyspark_emr",
+        ),
+        PackageSpec(
+            "examples/with_wandb",
+            unsupported_python_versions=[
+                # dagster-wandb dep
+                AvailablePythonVersion.V3_12,
+            ],
+        ),
+        # The 6 tutorials referenced in cloud onboarding cant test "source" due to dagster-cloud dep
+        PackageSpec(
+            "examples/assets_modern_data_stack",
+            pytest_tox_factors=["pypi"],
+        ),
+        PackageSpec(
+            "examples/assets_dbt_python",
+            pytest_tox_factors=["pypi"],
+            unsupported_python_versions=[
+                AvailablePythonVersion.V3_12,  # duckdb
+            ],
+        ),
+        PackageSpec(
+            "examples/assets_dynamic_partitions",
+            unsupported_python_versions=[
+                AvailablePythonVersion.V3_12,  # duckdb
+            ],
+        ),
+        PackageSpec(
+            "examples/quickstart_aws",
+            pytest_tox_factors=["pypi"],
+        ),
+        PackageSpec(
+            "examples/quickstart_etl",
+            pytest_tox_factors=["pypi"],
+        ),
+        PackageSpec(
+            "examples/quickstart_gcp",
+            pytest_tox_factors=["pypi"],
+        ),
+        PackageSpec(
+            "examples/quickstart_snowflake",
+            pytest_tox_factors=["pypi"],
+        ),
+        PackageSpec(
+            "examples/experimental/dagster-blueprints",
+        ),
+    )
 
 
 def _unsupported_dagster_python_versions(tox_factor: Optional[str]) -> List[AvailablePythonVersion]:
@@ -371,20 +384,24 @@ def _unsupported_dagster_python_versions(tox_factor: Optional[str]) -> List[Avai
     return []
 
 
-def test_subfolders(tests_folder_name: str) -> Iterable[str]:
-    tests_path = (
-        Path(__file__).parent
-        / Path("../../../../python_modules/dagster/dagster_tests/")
-        / Path(tests_folder_name)
-    )
-    for subfolder in tests_path.iterdir():
-        if subfolder.suffix == ".py" and subfolder.stem != "__init__":
-            raise Exception(
-                f"If you are splitting a test folder into parallel subfolders "
-                f"there should be no python files in the root of the folder. Found {subfolder}."
-            )
-        if subfolder.is_dir():
-            yield subfolder.name
+_DAGSTER_TESTS_ROOT = Path(GIT_REPO_ROOT) / "python_modules" / "dagster" / "dagster_tests"
+
+
+@functools.lru_cache(maxsize=None)
+def test_subfolders(tests_folder_name: str) -> Tuple[str, ...]:
+    tests_path = _DAGSTER_TESTS_ROOT / tests_folder_name
+    subfolder_names = []
+    # scandir reports whether each entry is a directory, so we don't stat every entry
+    with os.scandir(tests_path) as subfolders:
+        for subfolder in subfolders:
+            if subfolder.name.endswith(".py") and subfolder.name != "__init__.py":
+                raise Exception(
+                    f"If you are splitting a test folder into parallel subfolders there should"
+                    f" be no python files in the root of the folder. Found {subfolder.path}."
+                )
+            if subfolder.is_dir():
+                subfolder_names.append(subfolder.name)
+    return tuple(subfolder_names)
 
 
 def tox_factors_for_folder(tests_folder_name: str) -> List[str]:
@@ -394,310 +411,314 @@ def tox_factors_for_folder(tests_folder_name: str) -> List[str]:
     ]
 
 
-LIBRARY_PACKAGES_WITH_CUSTOM_CONFIG: List[PackageSpec] = [
-    PackageSpec(
-        "python_modules/automation",
-        unsupported_python_versions=[AvailablePythonVersion.V3_12],
-    ),
-    PackageSpec("python_modules/dagster-webserver", pytest_extra_cmds=ui_extra_cmds),
-    PackageSpec(
-        "python_modules/dagster",
-        env_vars=["AWS_ACCOUNT_ID"],
-        pytest_tox_factors=[
-            "api_tests",
-            "asset_defs_tests",
-            "cli_tests",
-            "core_tests_pydantic1",
-            "core_tests_pydantic2",
-            "daemon_sensor_tests",
-            "daemon_tests",
-            "definitions_tests",
-            "definitions_tests_pendulum_1",
-            "definitions_tests_pendulum_2",
-            "general_tests",
-            "general_tests_old_protobuf",
-            "launcher_tests",
-            "logging_tests",
-            "model_tests_pydantic1",
-            "model_tests_pydantic2",
-            "scheduler_tests",
-            "scheduler_tests_pendulum_1",
-            "scheduler_tests_pendulum_2",
-            "storage_tests",
-            "storage_tests_sqlalchemy_1_3",
-            "storage_tests_sqlalchemy_1_4",
-            "type_signature_tests",
-        ]
-        + tox_factors_for_folder("execution_tests"),
-        unsupported_python_versions=_unsupported_dagster_python_versions,
-    ),
-    PackageSpec(
-        "python_modules/dagster-graphql",
-        pytest_extra_cmds=dagster_graphql_extra_cmds,
-        pytest_tox_factors=[
-            "not_graphql_context_test_suite",
-            "sqlite_instance_multi_location",
-            "sqlite_instance_managed_grpc_env",
-            "sqlite_instance_deployed_grpc_env",
-            "sqlite_instance_code_server_cli_grpc_env",
-            "graphql_python_client",
-            "postgres-graphql_context_variants",
-            "postgres-instance_multi_location",
-            "postgres-instance_managed_grpc_env",
-            "postgres-instance_deployed_grpc_env",
-        ],
-        unsupported_python_versions=(
-            lambda tox_factor: (
-                [AvailablePythonVersion.V3_11]
-                if (
-                    tox_factor
-                    in {
-                        # test suites particularly likely to crash and/or hang
-                        # due to https://github.com/grpc/grpc/issues/31885
-                        "sqlite_instance_managed_grpc_env",
-                        "sqlite_instance_deployed_grpc_env",
-                        "sqlite_instance_code_server_cli_grpc_env",
-                        "sqlite_instance_multi_location",
-                        "postgres-instance_multi_location",
-                        "postgres-instance_managed_grpc_env",
-                        "postgres-instance_deployed_grpc_env",
-                    }
+# Built on first use rather than at import, since collecting the dagster tox factors scans the
+# test tree
+@functools.lru_cache(maxsize=None)
+def _library_packages_with_custom_config() -> Tuple[PackageSpec, ...]:
+    return (
+        PackageSpec(
+            "python_modules/automation",
+            unsupported_python_versions=[AvailablePythonVersion.V3_12],
+        ),
+        PackageSpec("python_modules/dagster-webserver", pytest_extra_cmds=ui_extra_cmds),
+        PackageSpec(
+            "python_modules/dagster",
+            env_vars=["AWS_ACCOUNT_ID"],
+            pytest_tox_factors=[
+                "api_tests",
+                "asset_defs_tests",
+                "cli_tests",
+                "core_tests_pydantic1",
+                "core_tests_pydantic2",
+                "daemon_sensor_tests",
+                "daemon_tests",
+                "definitions_tests",
+                "definitions_tests_pendulum_1",
+                "definitions_tests_pendulum_2",
+                "general_tests",
+                "general_tests_old_protobuf",
+                "launcher_tests",
+                "logging_tests",
+                "model_tests_pydantic1",
+                "model_tests_pydantic2",
+                "scheduler_tests",
+                "scheduler_tests_pendulum_1",
+                "scheduler_tests_pendulum_2",
+                "storage_tests",
+                "storage_tests_sqlalchemy_1_3",
+                "storage_tests_sqlalchemy_1_4",
+                "type_signature_tests",
+            ]
+            + tox_factors_for_folder("execution_tests"),
+            unsupported_python_versions=_unsupported_dagster_python_versions,
+        ),
+        PackageSpec(
+            "python_modules/dagster-graphql",
+            pytest_extra_cmds=dagster_graphql_extra_cmds,
+            pytest_tox_factors=[
+                "not_graphql_context_test_suite",
+                "sqlite_instance_multi_location",
+                "sqlite_instance_managed_grpc_env",
+                "sqlite_instance_deployed_grpc_env",
+                "sqlite_instance_code_server_cli_grpc_env",
+                "graphql_python_client",
+                "postgres-graphql_context_variants",
+                "postgres-instance_multi_location",
+                "postgres-instance_managed_grpc_env",
+                "postgres-instance_deployed_grpc_env",
+            ],
+            unsupported_python_versions=(
+                lambda tox_factor: (
+                    [AvailablePythonVersion.V3_11]
+                    if (
+                        tox_factor
+                        in {
+                            # test suites particularly likely to crash and/or hang
+                            # due to https://github.com/grpc/grpc/issues/31885
+                            "sqlite_instance_managed_grpc_env",
+                            "sqlite_instance_deployed_grpc_env",
+                            "sqlite_instance_code_server_cli_grpc_env",
+                            "sqlite_instance_multi_location",
+                            "postgres-instance_multi_location",
+                            "postgres-instance_managed_grpc_env",
+                            "postgres-instance_deployed_grpc_env",
+                        }
+                    )
+                    else []
                 )
-                else []
-            )
+            ),
+            timeout_in_minutes=30,
         ),
-        timeout_in_minutes=30,
-    ),
-    PackageSpec(
-        "python_modules/dagster-test",
-        unsupported_python_versions=[
-            # dagster-airflow
-            AvailablePythonVersion.V3_12,
-        ],
-    ),
-    PackageSpec(
-        "python_modules/libraries/dagster-dbt",
-        pytest_tox_factors=[
-            f"{deps_factor}-{command_factor}"
-            for deps_factor in ["dbt16", "dbt17", "dbt18", "pydantic1"]
-            for command_factor in ["cloud", "core-main", "legacy", "core-derived-metadata"]
-        ],
-        unsupported_python_versions=[
-            # duckdb
-            AvailablePythonVersion.V3_12,
-        ],
-    ),
-    PackageSpec(
-        "python_modules/libraries/dagster-snowflake",
-        pytest_tox_factors=[
-            "pydantic1",
-            "pydantic2",
-        ],
-        env_vars=["SNOWFLAKE_ACCOUNT", "SNOWFLAKE_USER", "SNOWFLAKE_PASSWORD"],
-    ),
-    PackageSpec(
-        "python_modules/libraries/dagster-airbyte",
-        pytest_tox_factors=["unit", "integration"],
-    ),
-    PackageSpec(
-        "python_modules/libraries/dagster-airflow",
-        # omit python 3.10 until we add support
-        unsupported_python_versions=[
-            AvailablePythonVersion.V3_10,
-            AvailablePythonVersion.V3_11,
-            AvailablePythonVersion.V3_12,
-        ],
-        env_vars=[
-            "AIRFLOW_HOME",
-            "AWS_ACCOUNT_ID",
-            "AWS_ACCESS_KEY_ID",
-            "AWS_SECRET_ACCESS_KEY",
-            "BUILDKITE_SECRETS_BUCKET",
-            "GOOGLE_APPLICATION_CREDENTIALS",
-        ],
-        pytest_extra_cmds=airflow_extra_cmds,
-        pytest_tox_factors=[
-            "default-airflow1",
-            "localdb-airflow1",
-            "persistentdb-airflow1",
-            "default-airflow2",
-            "localdb-airflow2",
-            "persistentdb-airflow2",
-        ],
-    ),
-    PackageSpec(
-        "python_modules/libraries/dagster-aws",
-        env_vars=["AWS_DEFAULT_REGION", "AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY"],
-    ),
-    PackageSpec(
-        "python_modules/libraries/dagster-azure",
-        env_vars=["AZURE_STORAGE_ACCOUNT_KEY"],
-    ),
-    PackageSpec(
-        "python_modules/libraries/dagster-celery",
-        env_vars=["AWS_ACCOUNT_ID", "AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY"],
-        pytest_extra_cmds=celery_extra_cmds,
-    ),
-    PackageSpec(
-        "python_modules/libraries/dagster-celery-docker",
-        env_vars=["AWS_ACCOUNT_ID", "AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY"],
-        pytest_extra_cmds=celery_docker_extra_cmds,
-        pytest_step_dependencies=test_project_depends_fn,
-    ),
-    PackageSpec(
-        "python_modules/libraries/dagster-dask",
-        env_vars=["AWS_SECRET_ACCESS_KEY", "AWS_ACCESS_KEY_ID", "AWS_DEFAULT_REGION"],
-    ),
-    PackageSpec(
-        "python_modules/libraries/dagster-databricks",
-        pytest_tox_factors=[
-            "pydantic1",
-            "pydantic2",
-        ],
-    ),
-    PackageSpec(
-        "python_modules/libraries/dagster-docker",
-        env_vars=["AWS_ACCOUNT_ID", "AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY"],
-        pytest_extra_cmds=docker_extra_cmds,
-        pytest_step_dependencies=test_project_depends_fn,
-    ),
-    PackageSpec(
-        "python_modules/libraries/dagster-duckdb",
-        unsupported_python_versions=[
-            # duckdb
-            AvailablePythonVersion.V3_12,
-        ],
-    ),
-    PackageSpec(
-        "python_modules/libraries/dagster-duckdb-pandas",
-        unsupported_python_versions=[
-            # duckdb
-            AvailablePythonVersion.V3_12,
-        ],
-    ),
-    PackageSpec(
-        "python_modules/libraries/dagster-duckdb-polars",
-        unsupported_python_versions=[
-            # duckdb
-            AvailablePythonVersion.V3_12,
-        ],
-    ),
-    PackageSpec(
-        "python_modules/libraries/dagster-duckdb-pyspark",
-        unsupported_python_versions=[
-            # duckdb
-            AvailablePythonVersion.V3_12,
-        ],
-    ),
-    PackageSpec(
-        "python_modules/libraries/dagster-pandas",
-        unsupported_python_versions=[
-            AvailablePythonVersion.V3_12,
-        ],
-    ),
-    PackageSpec(
-        "python_modules/libraries/dagster-gcp",
-        env_vars=[
-            "AWS_ACCESS_KEY_ID",
-            "AWS_SECRET_ACCESS_KEY",
-            "BUILDKITE_SECRETS_BUCKET",
-            "GCP_PROJECT_ID",
-        ],
-        pytest_extra_cmds=gcp_creds_extra_cmds,
-        # Remove once https://github.com/dagster-io/dagster/issues/2511 is resolved
-        retries=2,
-    ),
-    PackageSpec(
-        "python_modules/libraries/dagster-gcp-pandas",
-        env_vars=[
-            "AWS_ACCESS_KEY_ID",
-            "AWS_SECRET_ACCESS_KEY",
-            "BUILDKITE_SECRETS_BUCKET",
-            "GCP_PROJECT_ID",
-        ],
-        pytest_extra_cmds=gcp_creds_extra_cmds,
-        retries=2,
-    ),
-    PackageSpec(
-        "python_modules/libraries/dagster-gcp-pyspark",
-        env_vars=[
-            "AWS_ACCESS_KEY_ID",
-            "AWS_SECRET_ACCESS_KEY",
-            "BUILDKITE_SECRETS_BUCKET",
-            "GCP_PROJECT_ID",
-        ],
-        pytest_extra_cmds=gcp_creds_extra_cmds,
-    ),
-    PackageSpec(
-        "python_modules/libraries/dagster-ge",
-    ),
-    PackageSpec(
-        "python_modules/libraries/dagster-k8s",
-        env_vars=[
-            "AWS_ACCOUNT_ID",
-            "AWS_ACCESS_KEY_ID",
-            "AWS_SECRET_ACCESS_KEY",
-            "BUILDKITE_SECRETS_BUCKET",
-        ],
-        pytest_tox_factors=[
-            "default",
-            "old_kubernetes",
-        ],
-        pytest_extra_cmds=k8s_extra_cmds,
-    ),
-    PackageSpec(
-        "python_modules/libraries/dagster-mlflow",
-    ),
-    PackageSpec(
-        "python_modules/libraries/dagster-mysql",
-        pytest_extra_cmds=mysql_extra_cmds,
-        pytest_tox_factors=[
-            "storage_tests",
-            "storage_tests_sqlalchemy_1_3",
-        ],
-        always_run_if=has_storage_test_fixture_changes,
-    ),
-    PackageSpec(
-        "python_modules/libraries/dagster-snowflake-pandas",
-        env_vars=["SNOWFLAKE_ACCOUNT", "SNOWFLAKE_BUILDKITE_PASSWORD"],
-    ),
-    PackageSpec(
-        "python_modules/libraries/dagster-snowflake-pyspark",
-        env_vars=["SNOWFLAKE_ACCOUNT", "SNOWFLAKE_BUILDKITE_PASSWORD"],
-    ),
-    PackageSpec(
-        "python_modules/libraries/dagster-postgres",
-        pytest_extra_cmds=postgres_extra_cmds,
-        pytest_tox_factors=[
-            "storage_tests",
-            "storage_tests_sqlalchemy_1_3",
-        ],
-        always_run_if=has_storage_test_fixture_changes,
-    ),
-    PackageSpec(
-        "python_modules/libraries/dagster-twilio",
-        env_vars=["TWILIO_TEST_ACCOUNT_SID", "TWILIO_TEST_AUTH_TOKEN"],
-        # Remove once https://github.com/dagster-io/dagster/issues/2511 is resolved
-        retries=2,
-    ),
-    PackageSpec(
-        "python_modules/libraries/dagster-wandb",
-        unsupported_python_versions=[
-            # duckdb
-            AvailablePythonVersion.V3_12,
-        ],
-    ),
-    PackageSpec(
-        "python_modules/libraries/dagstermill",
-        pytest_tox_factors=["papermill1", "papermill2"],
-        retries=2,  # Workaround for flaky kernel issues
-        unsupported_python_versions=[
-            # duckdb
-            AvailablePythonVersion.V3_12,
-        ],
-    ),
-    PackageSpec(
-        ".buildkite/dagster-buildkite",
-        run_pytest=False,
-    ),
-]
+        PackageSpec(
+            "python_modules/dagster-test",
+            unsupported_python_versions=[
+                # dagster-airflow
+                AvailablePythonVersion.V3_12,
+            ],
+        ),
+        PackageSpec(
+            "python_modules/libraries/dagster-dbt",
+            pytest_tox_factors=[
+                f"{deps_factor}-{command_factor}"
+                for deps_factor in ["dbt16", "dbt17", "dbt18", "pydantic1"]
+                for command_factor in ["cloud", "core-main", "legacy", "core-derived-metadata"]
+            ],
+            unsupported_python_versions=[
+                # duckdb
+                AvailablePythonVersion.V3_12,
+            ],
+        ),
+        PackageSpec(
+            "python_modules/libraries/dagster-snowflake",
+            pytest_tox_factors=[
+                "pydantic1",
+                "pydantic2",
+            ],
+            env_vars=["SNOWFLAKE_ACCOUNT", "SNOWFLAKE_USER", "SNOWFLAKE_PASSWORD"],
+        ),
+        PackageSpec(
+            "python_modules/libraries/dagster-airbyte",
+            pytest_tox_factors=["unit", "integration"],
+        ),
+        PackageSpec(
+            "python_modules/libraries/dagster-airflow",
+            # omit python 3.10 until we add support
+            unsupported_python_versions=[
+                AvailablePythonVersion.V3_10,
+                AvailablePythonVersion.V3_11,
+                AvailablePythonVersion.V3_12,
+            ],
+            env_vars=[
+                "AIRFLOW_HOME",
+                "AWS_ACCOUNT_ID",
+                "AWS_ACCESS_KEY_ID",
+                "AWS_SECRET_ACCESS_KEY",
+                "BUILDKITE_SECRETS_BUCKET",
+                "GOOGLE_APPLICATION_CREDENTIALS",
+            ],
+            pytest_extra_cmds=airflow_extra_cmds,
+            pytest_tox_factors=[
+                "default-airflow1",
+                "localdb-airflow1",
+                "persistentdb-airflow1",
+                "default-airflow2",
+                "localdb-airflow2",
+                "persistentdb-airflow2",
+            ],
+        ),
+        PackageSpec(
+            "python_modules/libraries/dagster-aws",
+            env_vars=["AWS_DEFAULT_REGION", "AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY"],
+        ),
+        PackageSpec(
+            "python_modules/libraries/dagster-azure",
+            env_vars=["AZURE_STORAGE_ACCOUNT_KEY"],
+        ),
+        PackageSpec(
+            "python_modules/libraries/dagster-celery",
+            env_vars=["AWS_ACCOUNT_ID", "AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY"],
+            pytest_extra_cmds=celery_extra_cmds,
+        ),
+        PackageSpec(
+            "python_modules/libraries/dagster-celery-docker",
+            env_vars=["AWS_ACCOUNT_ID", "AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY"],
+            pytest_extra_cmds=celery_docker_extra_cmds,
+            pytest_step_dependencies=test_project_depends_fn,
+        ),
+        PackageSpec(
+            "python_modules/libraries/dagster-dask",
+            env_vars=["AWS_SECRET_ACCESS_KEY", "AWS_ACCESS_KEY_ID", "AWS_DEFAULT_REGION"],
+        ),
+        PackageSpec(
+            "python_modules/libraries/dagster-databricks",
+            pytest_tox_factors=[
+                "pydantic1",
+                "pydantic2",
+            ],
+        ),
+        PackageSpec(
+            "python_modules/libraries/dagster-docker",
+            env_vars=["AWS_ACCOUNT_ID", "AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY"],
+            pytest_extra_cmds=docker_extra_cmds,
+            pytest_step_dependencies=test_project_depends_fn,
+        ),
+        PackageSpec(
+            "python_modules/libraries/dagster-duckdb",
+            unsupported_python_versions=[
+                # duckdb
+                AvailablePythonVersion.V3_12,
+            ],
+        ),
+        PackageSpec(
+            "python_modules/libraries/dagster-duckdb-pandas",
+            unsupported_python_versions=[
+                # duckdb
+                AvailablePythonVersion.V3_12,
+            ],
+        ),
+        PackageSpec(
+            "python_modules/libraries/dagster-duckdb-polars",
+            unsupported_python_versions=[
+                # duckdb
+                AvailablePythonVersion.V3_12,
+            ],
+        ),
+        PackageSpec(
+            "python_modules/libraries/dagster-duckdb-pyspark",
+            unsupported_python_versions=[
+                # duckdb
+                AvailablePythonVersion.V3_12,
+            ],
+        ),
+        PackageSpec(
+            "python_modules/libraries/dagster-pandas",
+            unsupported_python_versions=[
+                AvailablePythonVersion.V3_12,
+            ],
+        ),
+        PackageSpec(
+            "python_modules/libraries/dagster-gcp",
+            env_vars=[
+                "AWS_ACCESS_KEY_ID",
+                "AWS_SECRET_ACCESS_KEY",
+                "BUILDKITE_SECRETS_BUCKET",
+                "GCP_PROJECT_ID",
+            ],
+            pytest_extra_cmds=gcp_creds_extra_cmds,
+            # Remove once https://github.com/dagster-io/dagster/issues/2511 is resolved
+            retries=2,
+        ),
+        PackageSpec(
+            "python_modules/libraries/dagster-gcp-pandas",
+            env_vars=[
+                "AWS_ACCESS_KEY_ID",
+                "AWS_SECRET_ACCESS_KEY",
+                "BUILDKITE_SECRETS_BUCKET",
+                "GCP_PROJECT_ID",
+            ],
+            pytest_extra_cmds=gcp_creds_extra_cmds,
+            retries=2,
+        ),
+        PackageSpec(
+            "python_modules/libraries/dagster-gcp-pyspark",
+            env_vars=[
+                "AWS_ACCESS_KEY_ID",
+                "AWS_SECRET_ACCESS_KEY",
+                "BUILDKITE_SECRETS_BUCKET",
+                "GCP_PROJECT_ID",
+            ],
+            pytest_extra_cmds=gcp_creds_extra_cmds,
+        ),
+        PackageSpec(
+            "python_modules/libraries/dagster-ge",
+        ),
+        PackageSpec(
+            "python_modules/libraries/dagster-k8s",
+            env_vars=[
+                "AWS_ACCOUNT_ID",
+                "AWS_ACCESS_KEY_ID",
+                "AWS_SECRET_ACCESS_KEY",
+                "BUILDKITE_SECRETS_BUCKET",
+            ],
+            pytest_tox_factors=[
+                "default",
+                "old_kubernetes",
+            ],
+            pytest_extra_cmds=k8s_extra_cmds,
+        ),
+        PackageSpec(
+            "python_modules/libraries/dagster-mlflow",
+        ),
+        PackageSpec(
+            "python_modules/libraries/dagster-mysql",
+            pytest_extra_cmds=mysql_extra_cmds,
+            pytest_tox_factors=[
+                "storage_tests",
+                "storage_tests_sqlalchemy_1_3",
+            ],
+            always_run_if=has_storage_test_fixture_changes,
+        ),
+        PackageSpec(
+            "python_modules/libraries/dagster-snowflake-pandas",
+            env_vars=["SNOWFLAKE_ACCOUNT", "SNOWFLAKE_BUILDKITE_PASSWORD"],
+        ),
+        PackageSpec(
+            "python_modules/libraries/dagster-snowflake-pyspark",
+            env_vars=["SNOWFLAKE_ACCOUNT", "SNOWFLAKE_BUILDKITE_PASSWORD"],
+        ),
+        PackageSpec(
+            "python_modules/libraries/dagster-postgres",
+            pytest_extra_cmds=postgres_extra_cmds,
+            pytest_tox_factors=[
+                "storage_tests",
+                "storage_tests_sqlalchemy_1_3",
+            ],
+            always_run_if=has_storage_test_fixture_changes,
+        ),
+        PackageSpec(
+            "python_modules/libraries/dagster-twilio",
+            env_vars=["TWILIO_TEST_ACCOUNT_SID", "TWILIO_TEST_AUTH_TOKEN"],
+            # Remove once https://github.com/dagster-io/dagster/issues/2511 is resolved
+            retries=2,
+        ),
+        PackageSpec(
+            "python_modules/libraries/dagster-wandb",
+            unsupported_python_versions=[
+                # duckdb
+                AvailablePythonVersion.V3_12,
+            ],
+        ),
+        PackageSpec(
+            "python_modules/libraries/dagstermill",
+            pytest_tox_factors=["papermill1", "papermill2"],
+            retries=2,  # Workaround for flaky kernel issues
+            unsupported_python_versions=[
+                # duckdb
+                AvailablePythonVersion.V3_12,
+            ],
+        ),
+        PackageSpec(
+            ".buildkite/dagster-buildkite",
+            run_pytest=False,
+        ),
+    )
@@ -7,6 +7,8 @@
 from dagster_buildkite.step_builder import BuildkiteQueue, CommandStepBuilder
 from dagster_buildkite.utils import CommandStep, make_buildkite_section_header
 
+_PY_VERSION_FACTOR_RE = re.compile(r"py(\d+)")
+
 _COMMAND_TYPE_TO_EMOJI_MAP = {
     "pytest": ":pytest:",
     "miscellaneous": ":sparkle:",
@@ -71,7 +73,7 @@ def build_tox_step(
 
 def _tox_env_to_label_suffix(tox_env: str) -> str:
     py_version, _, factor = tox_env.partition("-")
-    m = re.match(r"py(\d+)", py_version)
+    m = _PY_VERSION_FACTOR_RE.match(py_version)
     if m:
         version_number = m[1]
         number_str = f"{version_number[0]}.{version_number[1:]}"
@@ -82,7 +84,7 @@ def _tox_env_to_label_suffix(tox_env: str) -> str:
 
 def _resolve_python_version(tox_env: str) -> AvailablePythonVersion:
     factors = tox_env.split("-")
-    py_version_factor = next((f for f in factors if re.match(r"py\d+", f)), None)
+    py_version_factor = next((f for f in factors if _PY_VERSION_FACTOR_RE.match(f)), None)
     if py_version_factor:
         major, minor = int(py_version_factor[2]), int(py_version_factor[3:])
         return AvailablePythonVersion.from_major_minor(major, minor)
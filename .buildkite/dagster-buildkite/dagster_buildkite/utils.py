@@ -161,10 +161,14 @@ def connect_sibling_docker_container(
     ]
 
 
+# Branch classification is consulted by nearly every skip helper for every package, but the
+# branch never changes within a pipeline upload, so only classify each name once.
+@functools.lru_cache(maxsize=None)
 def is_feature_branch(branch_name: str = safe_getenv("BUILDKITE_BRANCH")) -> bool:
     return not (branch_name == "master" or branch_name.startswith("release"))
 
 
+@functools.lru_cache(maxsize=None)
 def is_release_branch(branch_name: str) -> bool:
     return branch_name.startswith("release-")
 
@@ -210,10 +214,12 @@ def skip_if_no_python_changes(overrides: Optional[Sequence[str]] = None):
     if any(path.suffix == ".py" for path in ChangedFiles.all):
         return None
 
-    if overrides and any(
-        Path(override) in path.parents for override in overrides for path in ChangedFiles.all
-    ):
-        return None
+    if overrides:
+        override_paths = [Path(override) for override in overrides]
+        if any(
+            override in path.parents for override in override_paths for path in ChangedFiles.all
+        ):
+            return None
 
     return "No python changes"
 
@@ -242,7 +248,8 @@ def skip_if_no_non_docs_markdown_changes():
     if not is_feature_branch():
         return None
 
-    if any(path.suffix == ".md" and Path("docs") not in path.parents for path in ChangedFiles.all):
+    docs = Path("docs")
+    if any(path.suffix == ".md" and docs not in path.parents for path in ChangedFiles.all):
         return None
 
     return "No markdown changes outside of docs"
@@ -250,16 +257,15 @@ def skip_if_no_non_docs_markdown_changes():
 
 @functools.lru_cache(maxsize=None)
 def has_helm_changes():
-    return any(Path("helm") in path.parents for path in ChangedFiles.all)
+    helm = Path("helm")
+    return any(helm in path.parents for path in ChangedFiles.all)
 
 
 @functools.lru_cache(maxsize=None)
 def has_storage_test_fixture_changes():
     # Attempt to ensure that changes to TestRunStorage and TestEventLogStorage suites trigger integration
-    return any(
-        Path("python_modules/dagster/dagster_tests/storage_tests/utils") in path.parents
-        for path in ChangedFiles.all
-    )
+    storage_test_utils = Path("python_modules/dagster/dagster_tests/storage_tests/utils")
+    return any(storage_test_utils in path.parents for path in ChangedFiles.all)
 
 
 def skip_if_no_helm_changes():
@@ -281,16 +287,19 @@ def message_contains(substring: str) -> bool:
 
 
 def skip_if_no_docs_changes():
-    if not is_feature_branch(os.getenv("BUILDKITE_BRANCH")):
+    if not is_feature_branch():
         return None
 
+    # Collect the top-level directories of all changes in a single pass
+    changed_roots = {path.parts[0] for path in ChangedFiles.all if len(path.parts) > 1}
+
     # If anything changes in the docs directory
-    if any(Path("docs") in path.parents for path in ChangedFiles.all):
+    if "docs" in changed_roots:
         logging.info("Run docs steps because files in the docs directory changed")
         return None
 
     # If anything changes in the examples directory. This is where our docs snippets live.
-    if any(Path("examples") in path.parents for path in ChangedFiles.all):
+    if "examples" in changed_roots:
         logging.info("Run docs steps because files in the examples directory changed")
         return None
 
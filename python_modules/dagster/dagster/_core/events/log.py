@@ -63,6 +63,9 @@ class EventLogEntry(
             structured event.
     """
 
+    # Event logs hold many of these, so don't give each one an instance __dict__
+    __slots__ = ()
+
     def __new__(
         cls,
         error_info,
@@ -50,6 +50,11 @@ def _ensure_resource_instances_in_cache(
         resource_defs: Mapping[str, ResourceDefinition],
         resource_config: Optional[Mapping[str, Any]] = None,
     ):
+        # Loads that share resources (e.g. repeated loads through the same IO manager) would
+        # otherwise set up another build_resources context just to hand back cached instances
+        if all(resource_key in self._resource_instance_cache for resource_key in resource_defs):
+            return
+
         for built_resource_key, built_resource in (
             self._exit_stack.enter_context(
                 build_resources(
@@ -84,3 +84,13 @@ def test_filter_dagster_events_from_cli_logs_user_json():
     """.split("\n")
 
     assert filter_dagster_events_from_cli_logs(logs) == []
+
+
+def test_filter_dagster_events_from_cli_logs_iterable():
+    logs = """
+    {"__class__": "DagsterEvent", "event_specific_data": {"__class__": "StepSuccessData", "duration_ms": 13.923579000000075}, "event_type_value": "STEP_SUCCESS", "logging_tags": {}, "message": "Finished", "pid": 2467, "pipeline_name": "foo", "solid_handle": {"__class__": "SolidHandle", "name": "do_input", "parent": null}, "step_key": "do_input", "step_kind_value": "COMPUTE"}
+    """.split("\n")
+
+    res = filter_dagster_events_from_cli_logs(line for line in logs)
+    assert len(res) == 1
+    check.inst(res[0].event_specific_data, StepSuccessData)
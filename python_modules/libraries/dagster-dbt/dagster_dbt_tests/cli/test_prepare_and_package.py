@@ -1,6 +1,7 @@
 import importlib
 import os
 import shutil
+import stat
 import sys
 from pathlib import Path
 from typing import cast
@@ -8,7 +9,7 @@
 import pytest
 import yaml
 from dagster import AssetsDefinition, materialize
-from dagster_dbt.cli.app import app
+from dagster_dbt.cli.app import app, sync_project_to_packaged_dir
 from dagster_dbt.core.resources_v2 import DbtCliResource
 from dagster_dbt.dbt_project import DbtProject
 from typer.testing import CliRunner
@@ -231,3 +232,64 @@ def test_prepare_and_package_with_state(
 
     result = materialize([my_dbt_assets], selection="orders", resources={"dbt": dbt})
     assert result.success
+
+
+@pytest.mark.parametrize(
+    "with_dangling_symlink",
+    [
+        False,
+        pytest.param(
+            True,
+            marks=pytest.mark.skipif(
+                sys.platform == "win32", reason="Creating symlinks requires privileges on Windows."
+            ),
+        ),
+    ],
+)
+def test_sync_project_to_packaged_dir(tmp_path: Path, with_dangling_symlink: bool) -> None:
+    project_dir = tmp_path.joinpath("dbt_project")
+    models_dir = project_dir.joinpath("models")
+    models_dir.mkdir(parents=True)
+    project_dir.joinpath("dbt_project.yml").write_text("name: test_project\n")
+    project_dir.joinpath(".gitignore").write_text("target/\n")
+    models_dir.joinpath("my_model.sql").write_text("select 1")
+
+    script_path = project_dir.joinpath("run.sh")
+    script_path.write_text("#!/bin/sh\n")
+    script_path.chmod(0o755)
+
+    target_dir = project_dir.joinpath("target")
+    target_dir.mkdir()
+    target_dir.joinpath("partial_parse.msgpack").write_bytes(b"")
+    target_dir.joinpath("manifest.json").write_text("{}")
+
+    if with_dangling_symlink:
+        models_dir.joinpath("broken.sql").symlink_to(models_dir.joinpath("missing.sql"))
+
+    os.utime(models_dir, (1_000_000_000, 1_000_000_000))
+
+    # The packaged directory is inside the project, so it must not be copied into itself.
+    packaged_project_dir = project_dir.joinpath("packaged")
+    project = DbtProject(project_dir=project_dir, packaged_project_dir=packaged_project_dir)
+    if with_dangling_symlink:
+        # Like shutil.copytree, the rest of the project is still copied before the error is raised.
+        with pytest.raises(shutil.Error, match="broken.sql"):
+            sync_project_to_packaged_dir(project)
+    else:
+        sync_project_to_packaged_dir(project)
+
+    assert sorted(
+        path.relative_to(packaged_project_dir).as_posix()
+        for path in packaged_project_dir.rglob("*")
+    ) == [
+        "dbt_project.yml",
+        "models",
+        "models/my_model.sql",
+        "run.sh",
+        "target",
+        "target/manifest.json",
+    ]
+    assert stat.S_IMODE(packaged_project_dir.joinpath("run.sh").stat().st_mode) == stat.S_IMODE(
+        script_path.stat().st_mode
+    )
+    assert packaged_project_dir.joinpath("models").stat().st_mtime == models_dir.stat().st_mtime
@@ -1,7 +1,9 @@
 import contextlib
+import io
 import json
 import os
 import re
+import shlex
 import sys
 import tempfile
 import time
@@ -38,6 +40,7 @@
 logger = get_dagster_logger()
 
 ANSI_ESCAPE = re.compile(r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])")
+_PIPE_BUFSIZE = 64 * 1024
 DEPRECATION_WARNING_TEXT = "{name} has been deprecated, use `SlingConnectionResource` for both source and target connections."
 
 
@@ -344,19 +347,39 @@ def _setup_config(self) -> Generator[None, None, None]:
 
     def _clean_line(self, line: str) -> str:
         """Removes ANSI escape sequences from a line of output."""
-        return ANSI_ESCAPE.sub("", line).replace("INF", "")
+        # Most lines have no escape sequences, and a substring check is much cheaper than a regex
+        # scan.
+        if "\x1b" in line:
+            line = ANSI_ESCAPE.sub("", line)
+        return line.replace("INF", "")
 
     def _process_stdout(self, stdout: IO[AnyStr], encoding="utf8") -> Iterator[str]:
         """Process stdout from the Sling CLI."""
-        for line in stdout:
-            assert isinstance(line, bytes)
-            fmt_line = bytes.decode(line, encoding=encoding, errors="replace")
-            yield self._clean_line(fmt_line)
+        # Decode the output a chunk at a time and split it into lines in C, rather than decoding
+        # each line separately. Only split on "\n", as iterating over the raw bytes did.
+        text_stdout = io.TextIOWrapper(
+            stdout,  # type: ignore
+            encoding=encoding,
+            errors="replace",
+            newline="\n",
+        )
+        try:
+            for line in text_stdout:
+                yield self._clean_line(line)
+        finally:
+            # Leave closing the underlying stream to the caller.
+            text_stdout.detach()
 
     def _exec_sling_cmd(
         self, cmd, stdin=None, stdout=PIPE, stderr=STDOUT, encoding="utf8"
     ) -> Generator[str, None, None]:
-        with Popen(cmd, shell=True, stdin=stdin, stdout=stdout, stderr=stderr) as proc:
+        # Run the Sling binary directly rather than through a shell. On Windows, Popen passes the
+        # command line to CreateProcess as is, so it does not need to be split.
+        args = cmd if sys.platform == "win32" else shlex.split(cmd)
+
+        # Sling emits many short log lines, so read the pipe in large chunks rather than the
+        # default 8 KiB.
+        with Popen(args, stdin=stdin, stdout=stdout, stderr=stderr, bufsize=_PIPE_BUFSIZE) as proc:
             if proc.stdout:
                 for line in self._process_stdout(proc.stdout, encoding=encoding):
                     yield line